@@ -7,14 +7,15 @@ app.openapi() to interfaces/openapi.json. The output directory is created if it
 does not exist.
 
 Usage:
-    python scripts/generate_openAPI.py
+    python scripts/generate_openapi.py
 """
 from __future__ import annotations
 
-import json
 import sys
 from pathlib import Path
 
+import orjson
+
 # Ensure project root (fastapi_backend) is in sys.path for "src" imports
 # Resolve this script's directory: <base>/fastapi_backend/scripts
 SCRIPT_DIR = Path(__file__).resolve().parent
@@ -29,6 +30,11 @@ except Exception as e:
     print(f"ERROR: Failed to import FastAPI app from src.api.main: {e}", file=sys.stderr)
     sys.exit(1)
 
+def _dump_schema(schema: dict) -> bytes:
+    """Serialize the schema as indented UTF-8 JSON."""
+    return orjson.dumps(schema, option=orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS)
+
+
 def main() -> int:
     """Generate and write OpenAPI schema to interfaces/openapi.json."""
     try:
@@ -42,8 +48,7 @@ def main() -> int:
     output_path = interfaces_dir / "openapi.json"
 
     try:
-        with output_path.open("w", encoding="utf-8") as f:
-            json.dump(schema, f, indent=2, ensure_ascii=False)
+        output_path.write_bytes(_dump_schema(schema))
     except Exception as e:
         print(f"ERROR: Failed to write OpenAPI schema to {output_path}: {e}", file=sys.stderr)
         return 3
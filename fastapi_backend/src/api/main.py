@@ -1,38 +1,208 @@
 import asyncio
 import logging
-from time import perf_counter
-from typing import Any, Dict
+from contextlib import asynccontextmanager, suppress
+from pathlib import Path
+from types import MappingProxyType
+from typing import AsyncIterator
 
-from fastapi import FastAPI, Body, HTTPException
-from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import JSONResponse
+import orjson
+from fastapi import FastAPI, HTTPException, Request
+from fastapi.responses import FileResponse, ORJSONResponse, Response, StreamingResponse
 from src.logging_config import configure_logging
 
+from src.api.middleware import FastCORSMiddleware, InternalErrorMiddleware, TimingMiddleware
 from src.api.schemas import ChatRequest, ChatResponse, normalize_to_chat_request
 from src.config import settings
-from src.services.chat import generate_reply
 
 # Initialize logging first so any early logs are captured
 configure_logging()
 
+# Pre-generated schema written by scripts/generate_openapi.py at build time
+BACKEND_ROOT = Path(__file__).resolve().parents[2]
+OPENAPI_STATIC_PATH = BACKEND_ROOT / "interfaces" / "openapi.json"
+
+# Interactive docs and the live OpenAPI schema are development aids. Production
+# pods only serve the API, so skip building the schema there; regenerate it
+# offline with scripts/generate_openapi.py instead.
+_docs_enabled = not settings.is_production()
+
+
+@asynccontextmanager
+async def _lifespan(_app: FastAPI) -> AsyncIterator[None]:
+    """Pre-warm the OpenAI connection on startup; close the pooled HTTP client on shutdown.
+
+    The chat service is only imported at startup when OpenAI is configured, and the
+    prewarm runs in the background so it never delays readiness.
+    """
+    prewarm = None
+    if settings.OPENAI_API_KEY:
+        prewarm = asyncio.create_task(_get_chat_service().prewarm_http_client())
+    yield
+    if prewarm is not None:
+        prewarm.cancel()
+        with suppress(asyncio.CancelledError):
+            await prewarm
+    if _chat_service is not None:
+        await _chat_service.aclose_http_client()
+
+
 # Initialize FastAPI app with basic metadata (can be expanded later)
 app = FastAPI(
     title="AI Copilot Backend",
     description="Backend API for the AI Copilot application",
     version="0.1.0",
+    openapi_url="/openapi.json" if _docs_enabled else None,
+    docs_url="/docs" if _docs_enabled else None,
+    redoc_url=None,
+    # orjson encodes replies (often multi-KB Unicode text) much faster than stdlib json
+    default_response_class=ORJSONResponse,
+    lifespan=_lifespan,
 )
 
 logger = logging.getLogger(__name__)
+# Bound once at import; /api/chat and the error handlers log on every request.
+_log_info = logger.info
+_log_warning = logger.warning
+_log_exception = logger.exception
+
+# Static parts of the structured error responses. Handlers copy a template and
+# add only the per-request fields (duration_ms, route, validation).
+_INVALID_PAYLOAD_DETAIL = MappingProxyType({
+    "code": "invalid_payload",
+    "message": "Payload does not match accepted shapes.",
+    "reason": "Invalid field types or values. See 'validation' for specifics.",
+    "accepted_shapes": [
+        {
+            "messages": [
+                {"role": "user|assistant|system", "content": "string (1-5000 chars)"}
+            ],
+            "response_style": "plain|list|guided (optional)",
+        },
+        {"message": "string (1-5000 chars)"},
+    ],
+    "examples": {
+        "minimal": {"message": "What is water?"},
+        "rich": {
+            "messages": [{"role": "user", "content": "Give me examples of vegetables"}],
+            "response_style": "list",
+        },
+    },
+    "hint": "Use role one of user|assistant|system and ensure 'content' is a non-empty string.",
+    "route": "/api/chat",
+    "note": "This route accepts either {message: string} or {messages: [{role, content}], response_style?}.",
+    "diagnostic": "normalize_to_chat_request.validation_error",
+})
+_ERR_UPSTREAM_TIMEOUT = MappingProxyType({
+    "code": "gateway_timeout",
+    "message": "The assistant took too long to respond. Please try again.",
+    "hint": "This may be due to an upstream AI timeout.",
+    "diagnostic": "route.await.generate_reply.timeout",
+})
+_ERR_UPSTREAM_FAILURE = MappingProxyType({
+    "code": "bad_gateway",
+    "message": "Failed to obtain a reply from the AI service.",
+    "hint": "Please try again soon.",
+    "diagnostic": "route.await.generate_reply.exception",
+})
+_ERR_INTERNAL = MappingProxyType({
+    "code": "internal_error",
+    "message": "Something went wrong while generating a reply.",
+    "hint": "Please try again.",
+    "diagnostic": "route.unexpected_exception",
+})
+
+# Pre-encoded bodies for the health check and chat preflight routes. Only the
+# bytes are shared: a Response instance must not be reused, since middleware
+# appends headers to it.
+_HEALTHY_BODY = b'{"message":"Healthy"}'
+_EMPTY_JSON_BODY = b"{}"
+
+# The chat service (and httpx behind it) is imported on the first /api/chat
+# request, so worker start-up, health probes and preflights don't pay for it.
+_chat_service = None
+
+
+def _get_chat_service():
+    """Return the src.services.chat module, importing it on first use."""
+    global _chat_service
+    if _chat_service is None:
+        from src.services import chat
+
+        _chat_service = chat
+    return _chat_service
+
+
+async def _ndjson_stream(chunks: AsyncIterator[str]) -> AsyncIterator[bytes]:
+    """Encode reply chunks as NDJSON lines of {"delta": "..."}."""
+    async for chunk in chunks:
+        yield orjson.dumps({"delta": chunk}) + b"\n"
+
+
+class _UpstreamError(Exception):
+    """Raised when the chat service fails unexpectedly; reported as 502 Bad Gateway."""
+
+
+def _request_ms(request: Request) -> int:
+    """Milliseconds since TimingMiddleware started timing this request."""
+    timer = getattr(request.state, "timer", None)
+    return timer.ms if timer is not None else 0
+
+
+def _error_response(request: Request, status_code: int, template: MappingProxyType, duration_ms: int) -> ORJSONResponse:
+    """Build the structured {"error": {...}} envelope from a static template."""
+    return ORJSONResponse(
+        status_code=status_code,
+        content={"error": {**template, "duration_ms": duration_ms, "route": request.url.path}},
+    )
+
+
+@app.exception_handler(asyncio.TimeoutError)
+async def _upstream_timeout_handler(request: Request, exc: asyncio.TimeoutError) -> ORJSONResponse:
+    """Map a generate_reply overrun of the route budget to 504 Gateway Timeout."""
+    total_ms = _request_ms(request)
+    _log_warning("Upstream chat service timed out after %d ms", total_ms)
+    return _error_response(request, 504, _ERR_UPSTREAM_TIMEOUT, total_ms)
+
 
+@app.exception_handler(_UpstreamError)
+async def _upstream_error_handler(request: Request, exc: _UpstreamError) -> ORJSONResponse:
+    """Map an unexpected chat service failure to 502 Bad Gateway."""
+    total_ms = _request_ms(request)
+    _log_exception(
+        "Upstream chat service error after %d ms: %s", total_ms, str(exc.__cause__), exc_info=exc.__cause__
+    )
+    return _error_response(request, 502, _ERR_UPSTREAM_FAILURE, total_ms)
+
+
+async def _unexpected_error_handler(request: Request, exc: Exception) -> ORJSONResponse:
+    """Map any other unhandled error to 500 with the standard envelope.
+
+    Installed through InternalErrorMiddleware rather than as an Exception handler,
+    so the response still passes through FastCORSMiddleware and TimingMiddleware.
+    """
+    total_ms = _request_ms(request)
+    _log_exception("Route %s failed after %d ms: %s", request.url.path, total_ms, exc)
+    return _error_response(request, 500, _ERR_INTERNAL, total_ms)
+
+
+# Innermost: unexpected errors become the 500 envelope before CORS and timing headers are added
+app.add_middleware(InternalErrorMiddleware, handler=_unexpected_error_handler)
 # Configure CORS to allow the frontend origin
-# FRONTEND_ORIGIN comes from centralized settings (env-backed).
-app.add_middleware(
-    CORSMiddleware,
-    allow_origins=[settings.FRONTEND_ORIGIN],
-    allow_credentials=True,
-    allow_methods=["*"],
-    allow_headers=["*"],
-)
+# FRONTEND_ORIGIN comes from centralized settings (env-backed). There is exactly
+# one allowed origin, so a single bytes comparison replaces CORSMiddleware.
+app.add_middleware(FastCORSMiddleware, allow_origin=settings.FRONTEND_ORIGIN)
+# Outermost: times every request for handlers and the X-Duration-Ms header
+app.add_middleware(TimingMiddleware)
+
+
+# In production, publish the pre-generated schema as a static file (if it was
+# built) instead of computing it on the request path.
+if not _docs_enabled and OPENAPI_STATIC_PATH.is_file():
+    @app.get("/openapi.json", include_in_schema=False)
+    def openapi_static():
+        """Serve the OpenAPI schema pre-generated by scripts/generate_openapi.py."""
+        return FileResponse(OPENAPI_STATIC_PATH, media_type="application/json")
+
 
 @app.get("/", summary="Health Check", tags=["Health"])
 def health_check():
@@ -41,10 +211,10 @@ def health_check():
 
     Returns
     -------
-    dict
-        Simple JSON indicating the service is healthy.
+    Response
+        Pre-encoded JSON body {"message": "Healthy"} with an application/json content type.
     """
-    return {"message": "Healthy"}
+    return Response(content=_HEALTHY_BODY, media_type="application/json")
 
 # PUBLIC_INTERFACE
 @app.options(
@@ -58,29 +228,39 @@ def chat_preflight():
     Handle CORS preflight request for /api/chat.
     Returns an empty 200 so browsers can proceed with the POST.
     """
-    return {}
+    return Response(content=_EMPTY_JSON_BODY, media_type="application/json")
 
 # PUBLIC_INTERFACE
 @app.post(
     "/api/chat",
     response_model=ChatResponse,
+    response_model_exclude_unset=True,
     summary="Generate assistant reply",
     description="Accepts either a minimal {'message': string} or a full {'messages': [...], 'response_style'?} payload and returns a concise assistant reply.",
     tags=["Chat"],
+    responses={
+        200: {
+            "description": "The reply as JSON, or NDJSON {\"delta\"} lines when the request sets 'stream': true.",
+            "content": {"application/x-ndjson": {"schema": {"type": "string"}}},
+        }
+    },
+    # The body is parsed by hand (see chat()); document it for OpenAPI here.
+    openapi_extra={
+        "requestBody": {
+            "required": True,
+            "description": "Minimal: {'message': '...'}; or Rich: {'messages': [{role,content}], 'response_style'?: 'plain'|'list'|'guided'}",
+            "content": {"application/json": {"schema": {"type": "object", "additionalProperties": True}}},
+        }
+    },
 )
-async def chat(
-    body: Dict[str, Any] = Body(
-        ...,
-        description="Minimal: {'message': '...'}; or Rich: {'messages': [{role,content}], 'response_style'?: 'plain'|'list'|'guided'}",
-    )
-):
+async def chat(request: Request):
     """
     Generate a reply from the assistant based on prior messages.
 
     Parameters
     ----------
-    body : dict
-        The raw chat request payload. Accepted shapes:
+    request : Request
+        The incoming request; its JSON body is the raw chat payload. Accepted shapes:
         - Minimal: {'message': '...'}
         - Rich: {'messages': [{role:'user'|'assistant'|'system', content:'...'}, ...], 'response_style'?: 'plain'|'list'|'guided'}
 
@@ -88,132 +268,72 @@ async def chat(
     ----------------
     1) {'message':'What is water?'}
     2) {'messages':[{'role':'user','content':'Give me examples of vegetables'}], 'response_style':'list'}
+    3) {'messages':[{'role':'user','content':'What is water?'}], 'stream':true}  -> NDJSON deltas
 
     Returns
     -------
-    ChatResponse | JSONResponse
-        JSON containing the assistant's reply text under the 'reply' field, or a structured error with cause.
+    dict
+        JSON containing the assistant's reply text under the 'reply' field. Failures
+        raise and are rendered as structured errors by the app's exception handlers
+        (400/502/504) or by InternalErrorMiddleware (500).
     """
-    total_start = perf_counter()
+    # Parse the body with orjson and normalize it to the ChatRequest model.
+    # Skipping a Body(Dict[str, Any]) parameter avoids a redundant Pydantic
+    # dict validation, since normalize_to_chat_request validates anyway.
+    raw_body = await request.body()
+    debug_enabled = logger.isEnabledFor(logging.DEBUG)
+    if debug_enabled:
+        logger.debug("POST /api/chat raw body: %s", raw_body)
     try:
-        # Normalize incoming payload to ChatRequest model.
-        logger.debug("POST /api/chat raw body: %s", body)
-        try:
-            normalized: ChatRequest = normalize_to_chat_request(body)
-            logger.debug(
-                "Normalized chat request: %d message(s), response_style=%s",
-                len(normalized.messages),
-                getattr(normalized, "response_style", None),
-            )
-        except ValueError as ve:
-            # Provide precise 400 with accepted shapes and validation details
-            logger.debug("Invalid chat payload received: %s", body)
-            detail = {
-                "code": "invalid_payload",
-                "message": "Payload does not match accepted shapes.",
-                "reason": "Invalid field types or values. See 'validation' for specifics.",
-                "accepted_shapes": [
-                    {
-                        "messages": [
-                            {"role": "user|assistant|system", "content": "string (1-5000 chars)"}
-                        ],
-                        "response_style": "plain|list|guided (optional)",
-                    },
-                    {"message": "string (1-5000 chars)"},
-                ],
-                "examples": {
-                    "minimal": {"message": "What is water?"},
-                    "rich": {
-                        "messages": [{"role": "user", "content": "Give me examples of vegetables"}],
-                        "response_style": "list",
-                    },
-                },
-                "hint": "Use role one of user|assistant|system and ensure 'content' is a non-empty string.",
-                "validation": str(ve),
-                "route": "/api/chat",
-                "note": "This route accepts either {message: string} or {messages: [{role, content}], response_style?}.",
-                "diagnostic": "normalize_to_chat_request.validation_error",
-            }
-            raise HTTPException(status_code=400, detail=detail) from ve
-
-        # Route-level time budget: 13s. We always complete or fail fast within SLA.
-        try:
-            reply_text = await asyncio.wait_for(
-                generate_reply(normalized.messages, response_style=normalized.response_style),
-                timeout=13.0,
-            )
-        except asyncio.TimeoutError:
-            # Inner timeout while awaiting generate_reply should be rare; map to 504.
-            total_ms = int((perf_counter() - total_start) * 1000)
-            logger.warning("Upstream chat service timed out after %d ms", total_ms)
-            return JSONResponse(
-                status_code=504,
-                content={
-                    "error": {
-                        "code": "gateway_timeout",
-                        "message": "The assistant took too long to respond. Please try again.",
-                        "hint": "This may be due to an upstream AI timeout.",
-                        "duration_ms": total_ms,
-                        "route": "/api/chat",
-                        "diagnostic": "route.await.generate_reply.timeout",
-                    }
-                },
-            )
-        except Exception as upstream:
-            # Treat unexpected upstream errors as Bad Gateway, not as 400.
-            total_ms = int((perf_counter() - total_start) * 1000)
-            logger.exception("Upstream chat service error after %d ms: %s", total_ms, str(upstream))
-            return JSONResponse(
-                status_code=502,
-                content={
-                    "error": {
-                        "code": "bad_gateway",
-                        "message": "Failed to obtain a reply from the AI service.",
-                        "hint": "Please try again soon.",
-                        "duration_ms": total_ms,
-                        "route": "/api/chat",
-                        "diagnostic": "route.await.generate_reply.exception",
-                    }
-                },
-            )
-
-        total_ms = int((perf_counter() - total_start) * 1000)
-        logger.info("Route /api/chat total duration=%d ms", total_ms)
-        return ChatResponse(reply=reply_text)
-    except asyncio.TimeoutError:
-        total_ms = int((perf_counter() - total_start) * 1000)
-        logger.warning("Route /api/chat timed out after %d ms", total_ms)
-        return JSONResponse(
-            status_code=504,
-            content={
-                "error": {
-                    "code": "gateway_timeout",
-                    "message": "The assistant took too long to respond. Please try again.",
-                    "hint": "This may be due to an upstream AI timeout.",
-                    "duration_ms": total_ms,
-                    "route": "/api/chat",
-                    "diagnostic": "route.timeout",
-                }
-            },
+        # orjson.JSONDecodeError is a ValueError, so malformed JSON is a 400 too
+        body = orjson.loads(raw_body)
+        normalized: ChatRequest = normalize_to_chat_request(body)
+    except ValueError as ve:
+        # Provide precise 400 with accepted shapes and validation details
+        if debug_enabled:
+            logger.debug("Invalid chat payload received: %s", raw_body)
+        _log_info("Route /api/chat returned 400 after %d ms", _request_ms(request))
+        detail = {**_INVALID_PAYLOAD_DETAIL, "validation": str(ve)}
+        raise HTTPException(status_code=400, detail=detail) from ve
+    if debug_enabled:
+        logger.debug(
+            "Normalized chat request: %d message(s), response_style=%s",
+            len(normalized.messages),
+            getattr(normalized, "response_style", None),
         )
-    except HTTPException as he:
-        # Already sanitized 400
-        total_ms = int((perf_counter() - total_start) * 1000)
-        logger.info("Route /api/chat returned %d after %d ms", he.status_code, total_ms)
-        raise
-    except Exception as e:
-        total_ms = int((perf_counter() - total_start) * 1000)
-        logger.exception("Route /api/chat failed after %d ms: %s", total_ms, str(e))
-        return JSONResponse(
-            status_code=500,
-            content={
-                "error": {
-                    "code": "internal_error",
-                    "message": "Something went wrong while generating a reply.",
-                    "hint": "Please try again.",
-                    "duration_ms": total_ms,
-                    "route": "/api/chat",
-                    "diagnostic": "route.unexpected_exception",
-                }
-            },
+
+    chat_service = _get_chat_service()
+    if normalized.stream:
+        # Chunks flow to the client as they are produced, instead of after the
+        # whole reply is generated. There is no route budget here: stream_reply
+        # bounds its own upstream time and falls back to a friendly message.
+        return StreamingResponse(
+            _ndjson_stream(chat_service.stream_reply(normalized.messages, response_style=normalized.response_style)),
+            media_type="application/x-ndjson",
         )
+
+    # Route-level time budget: 13s. We always complete or fail fast within SLA;
+    # an overrun raises TimeoutError, which _upstream_timeout_handler maps to 504.
+    # asyncio.timeout (3.11+) arms a timer handle on the current task instead of
+    # wrapping the coroutine in a new one like asyncio.wait_for.
+    try:
+        async with asyncio.timeout(13.0):
+            reply_text = await chat_service.generate_reply(normalized.messages, response_style=normalized.response_style)
+    except asyncio.TimeoutError:
+        raise
+    except Exception as upstream:
+        # Treat unexpected upstream errors as Bad Gateway, not as 400/500.
+        raise _UpstreamError() from upstream
+
+    _log_info("Route /api/chat total duration=%d ms", _request_ms(request))
+    # Plain dict: response_model validates it once on the way out, instead of
+    # validating a ChatResponse here and again during serialization.
+    return {"reply": reply_text}
+
+
+if __name__ == "__main__":
+    import uvicorn
+
+    # uvloop (libuv event loop) and httptools (C HTTP parser) are pinned in
+    # requirements.txt; select them explicitly instead of relying on "auto".
+    uvicorn.run("src.api.main:app", host="0.0.0.0", port=3001, loop="uvloop", http="httptools")
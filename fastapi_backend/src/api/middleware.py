@@ -0,0 +1,160 @@
+"""
+ASGI middleware for the FastAPI backend.
+
+These are written as plain ASGI callables rather than with @app.middleware("http")
+(BaseHTTPMiddleware), which adds a task and memory streams to every request.
+"""
+from typing import Awaitable, Callable
+
+from starlette.requests import Request
+from starlette.responses import Response
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from src.timing import Timer
+
+
+# PUBLIC_INTERFACE
+class InternalErrorMiddleware:
+    """Render unhandled exceptions with handler(request, exc) from inside the middleware stack.
+
+    Starlette runs an app-level Exception handler from ServerErrorMiddleware, which
+    sits outside every user middleware, so its 500 misses the CORS and timing
+    headers. Added before FastCORSMiddleware and TimingMiddleware, this one runs
+    inside them instead. The handler is responsible for logging; the exception is
+    not re-raised unless the response had already started (nothing to render then).
+    """
+
+    def __init__(self, app: ASGIApp, handler: Callable[[Request, Exception], Awaitable[Response]]) -> None:
+        self.app = app
+        self.handler = handler
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        response_started = False
+
+        async def send_tracking_start(message: Message) -> None:
+            nonlocal response_started
+            if message["type"] == "http.response.start":
+                response_started = True
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_tracking_start)
+        except Exception as exc:
+            if response_started:
+                raise
+            response = await self.handler(Request(scope), exc)
+            await response(scope, receive, send)
+
+
+# PUBLIC_INTERFACE
+class TimingMiddleware:
+    """Time each HTTP request and report the duration in an X-Duration-Ms header.
+
+    The Timer is stored on request.state.timer so route and exception handlers
+    can include duration_ms in their payloads without timing themselves.
+    """
+
+    def __init__(self, app: ASGIApp) -> None:
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        timer = Timer()
+        scope.setdefault("state", {})["timer"] = timer
+
+        async def send_with_duration(message: Message) -> None:
+            if message["type"] == "http.response.start":
+                headers = list(message.get("headers", []))
+                headers.append((b"x-duration-ms", str(timer.ms).encode("latin-1")))
+                message = {**message, "headers": headers}
+            await send(message)
+
+        await self.app(scope, receive, send_with_duration)
+
+
+# Methods advertised on preflight responses (CORSMiddleware's expansion of "*").
+_PREFLIGHT_ALLOW_METHODS = b"DELETE, GET, HEAD, OPTIONS, PATCH, POST, PUT"
+
+
+# PUBLIC_INTERFACE
+class FastCORSMiddleware:
+    """CORS for a single allowed origin, with credentials and any method/header.
+
+    Equivalent to Starlette's CORSMiddleware configured with one entry in
+    allow_origins, allow_credentials=True and allow_methods/allow_headers=["*"],
+    but the Origin header is compared against one precomputed bytes value and
+    the response headers are prebuilt, instead of re-parsing headers and walking
+    origin lists on every request.
+    """
+
+    def __init__(self, app: ASGIApp, allow_origin: str, max_age: int = 600) -> None:
+        self.app = app
+        self._origin = allow_origin.encode("latin-1")
+        self._simple_headers = (
+            (b"access-control-allow-origin", self._origin),
+            (b"access-control-allow-credentials", b"true"),
+            (b"vary", b"Origin"),
+        )
+        self._preflight_headers = self._simple_headers + (
+            (b"access-control-allow-methods", _PREFLIGHT_ALLOW_METHODS),
+            (b"access-control-max-age", str(max_age).encode("latin-1")),
+        )
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        origin = requested_method = requested_headers = None
+        for name, value in scope["headers"]:
+            if name == b"origin":
+                origin = value
+            elif name == b"access-control-request-method":
+                requested_method = value
+            elif name == b"access-control-request-headers":
+                requested_headers = value
+
+        if origin is None:
+            await self.app(scope, receive, send)
+            return
+
+        allowed = origin == self._origin
+        if scope["method"] == "OPTIONS" and requested_method is not None:
+            await self._preflight(send, allowed, requested_headers)
+            return
+
+        if not allowed:
+            await self.app(scope, receive, send)
+            return
+
+        async def send_with_cors(message: Message) -> None:
+            if message["type"] == "http.response.start":
+                headers = list(message.get("headers", []))
+                headers.extend(self._simple_headers)
+                message = {**message, "headers": headers}
+            await send(message)
+
+        await self.app(scope, receive, send_with_cors)
+
+    async def _preflight(self, send: Send, allowed: bool, requested_headers) -> None:
+        """Answer a CORS preflight directly, as CORSMiddleware does."""
+        if allowed:
+            status, body = 200, b"OK"
+            headers = list(self._preflight_headers)
+            if requested_headers is not None:
+                # Any header is allowed, so mirror back what was requested
+                headers.append((b"access-control-allow-headers", requested_headers))
+        else:
+            status, body = 400, b"Disallowed CORS origin"
+            headers = [(b"vary", b"Origin")]
+        headers.append((b"content-type", b"text/plain; charset=utf-8"))
+        headers.append((b"content-length", str(len(body)).encode("latin-1")))
+        await send({"type": "http.response.start", "status": status, "headers": headers})
+        await send({"type": "http.response.body", "body": body})
@@ -1,7 +1,17 @@
 from enum import Enum
-from typing import List, Optional, Literal, Any, Dict
+from typing import Annotated, List, Optional, Literal, Any, Dict, Union
 
-from pydantic import BaseModel, Field, ValidationError, constr
+from pydantic import (
+    BaseModel,
+    ConfigDict,
+    Discriminator,
+    Field,
+    Tag,
+    TypeAdapter,
+    ValidationError,
+    constr,
+    field_validator,
+)
 
 
 # PUBLIC_INTERFACE
@@ -15,19 +25,42 @@ class RoleEnum(str, Enum):
 # PUBLIC_INTERFACE
 class Message(BaseModel):
     """Represents a single chat message with a role and content."""
+    model_config = ConfigDict(defer_build=True)
+
     role: RoleEnum = Field(..., description="The role of the message sender: user, assistant, or system.")
     content: constr(min_length=1, max_length=5000) = Field(  # type: ignore[valid-type]
         ..., description="The textual content of the message (1-5000 characters)."
     )
 
+    @field_validator("content", mode="before")
+    @classmethod
+    def _content_not_blank(cls, v: Any) -> Any:
+        """Reject whitespace-only content; non-strings are left to the str validator."""
+        if isinstance(v, str) and not v.strip():
+            raise ValueError("content must be a non-empty string")
+        return v
+
+    @property
+    def normalized(self) -> str:
+        """Content with surrounding whitespace removed.
+
+        Computed on each access rather than cached: a cached value would survive
+        model_copy(update=...) and assignment, since the model is mutable.
+        """
+        return (self.content or "").strip()
+
 
 # PUBLIC_INTERFACE
 class ChatRequest(BaseModel):
     """Request model for generating an assistant reply from a list of prior messages."""
-    messages: List[Message] = Field(..., description="Ordered list of chat messages forming the conversation.")
+    model_config = ConfigDict(defer_build=True)
+
+    messages: List[Message] = Field(
+        ..., min_length=1, description="Ordered list of chat messages forming the conversation."
+    )
     stream: Optional[bool] = Field(
         default=False,
-        description="Whether the response should be streamed. Placeholder, not implemented in this version."
+        description="Whether to stream the reply as NDJSON: one {\"delta\": \"...\"} object per line."
     )
     response_style: Optional[Literal['list', 'plain', 'guided']] = Field(
         default=None,
@@ -41,16 +74,58 @@ class ChatRequest(BaseModel):
 # PUBLIC_INTERFACE
 class ChatResponse(BaseModel):
     """Response model containing the assistant's reply as plain text."""
+    model_config = ConfigDict(defer_build=True)
+
     reply: str = Field(..., description="The assistant's reply.")
 
 
 # PUBLIC_INTERFACE
 class ChatRequestLegacy(BaseModel):
     """Compatibility request model for legacy payloads that send a single 'message' string."""
+    model_config = ConfigDict(defer_build=True)
+
     message: constr(min_length=1, max_length=5000) = Field(  # type: ignore[valid-type]
         ..., description="Legacy single user message content."
     )
 
+    @field_validator("message", mode="before")
+    @classmethod
+    def _coerce_message(cls, v: Any) -> Any:
+        """Allow basic non-string (number/bool) by coercing to string, then reject whitespace-only text."""
+        if isinstance(v, (int, float, bool)):
+            v = str(v)
+        if isinstance(v, str) and not v.strip():
+            raise ValueError("Message must be a non-empty string")
+        return v
+
+
+def _payload_shape(data: Any) -> Optional[str]:
+    """Discriminator for the accepted payload shapes: 'messages' wins over 'message'."""
+    if isinstance(data, dict):
+        if "messages" in data:
+            return "modern"
+        if "message" in data:
+            return "legacy"
+    return None
+
+
+# Both accepted payload shapes as one tagged union, validated in pydantic-core:
+# the branch is picked by _payload_shape and only that model is validated, so
+# errors describe just the shape that was sent. With defer_build the validator is
+# built on the first request, like the models', and reused afterwards.
+_PAYLOAD_ADAPTER: TypeAdapter[Union[ChatRequest, ChatRequestLegacy]] = TypeAdapter(
+    Annotated[
+        Union[
+            Annotated[ChatRequest, Tag("modern")],
+            Annotated[ChatRequestLegacy, Tag("legacy")],
+        ],
+        Discriminator(_payload_shape),
+    ],
+    config=ConfigDict(defer_build=True),
+)
+# Bound once so each request skips the attribute lookup on the adapter.
+_validate_payload = _PAYLOAD_ADAPTER.validate_python
+
 
 # PUBLIC_INTERFACE
 def normalize_to_chat_request(data: Dict[str, Any]) -> ChatRequest:
@@ -82,107 +157,28 @@ def normalize_to_chat_request(data: Dict[str, Any]) -> ChatRequest:
         elif "query" in data and isinstance(data["query"], (str, int, float)):
             data = {**data, "message": str(data["query"])}
 
-    # Prefer modern shape when messages key is present
-    if "messages" in data:
-        try:
-            # Validate that content fields are strings (avoid non-string types)
-            msgs = data.get("messages")
-            if not isinstance(msgs, list) or not msgs:
-                raise ValidationError.from_exception_data(
-                    title="ChatRequest",
-                    line_errors=[
-                        {
-                            "type": "list_too_short",
-                            "loc": ("messages",),
-                            "msg": "messages must be a non-empty array",
-                            "input": msgs,
-                            "ctx": {"min_length": 1},
-                        }
-                    ],
-                )
-            # Ensure each message.content is a string with non-whitespace
-            for idx, m in enumerate(msgs):
-                if not isinstance(m, dict):
-                    raise ValidationError.from_exception_data(
-                        title="ChatRequest",
-                        line_errors=[
-                            {
-                                "type": "model_type",
-                                "loc": ("messages", idx),
-                                "msg": "Each message must be an object",
-                                "input": m,
-                            }
-                        ],
-                    )
-                content = m.get("content")
-                if not isinstance(content, str):
-                    raise ValidationError.from_exception_data(
-                        title="ChatRequest",
-                        line_errors=[
-                            {
-                                "type": "string_type",
-                                "loc": ("messages", idx, "content"),
-                                "msg": "content must be a string",
-                                "input": content,
-                            }
-                        ],
-                    )
-                if not content.strip():
-                    raise ValidationError.from_exception_data(
-                        title="ChatRequest",
-                        line_errors=[
-                            {
-                                "type": "string_too_short",
-                                "loc": ("messages", idx, "content"),
-                                "msg": "content must be a non-empty string",
-                                "input": content,
-                                "ctx": {"min_length": 1},
-                            }
-                        ],
-                    )
-            return ChatRequest.model_validate(data)
-        except ValidationError as ve:
-            # Re-raise a friendlier error with compact details
-            errs = ve.errors()
-            raise ValueError(f"Invalid 'messages' payload. Errors: {errs}") from ve
-
-    # Accept legacy/minimal shape
-    if "message" in data:
-        try:
-            msg_val = data.get("message")
-            # Allow basic non-string (number/bool) but coerce to string, then validate non-empty trimmed
-            if isinstance(msg_val, (int, float, bool)):
-                msg_val = str(msg_val)
-            if not isinstance(msg_val, str):
-                raise ValidationError.from_exception_data(
-                    title="ChatRequestLegacy",
-                    line_errors=[
-                        {
-                            "type": "string_type",
-                            "loc": ("message",),
-                            "msg": "Message must be a string",
-                            "input": msg_val,
-                        }
-                    ],
-                )
-            if not msg_val.strip():
-                raise ValidationError.from_exception_data(
-                    title="ChatRequestLegacy",
-                    line_errors=[
-                        {
-                            "type": "string_too_short",
-                            "loc": ("message",),
-                            "msg": "Message must be a non-empty string",
-                            "input": msg_val,
-                            "ctx": {"min_length": 1},
-                        }
-                    ],
-                )
-            legacy = ChatRequestLegacy.model_validate({"message": msg_val})
-        except ValidationError as ve:
-            raise ValueError(f"Invalid legacy 'message' payload. Errors: {ve.errors()}") from ve
-        # Convert into modern ChatRequest with a single user message
-        return ChatRequest(messages=[Message(role=RoleEnum.user, content=legacy.message)])
-
-    # Neither shape present
-    raise ValueError("Missing required field: provide either 'messages' or 'message'.")
+    tag = _payload_shape(data)
+    if tag is None:
+        # Neither shape present
+        raise ValueError("Missing required field: provide either 'messages' or 'message'.")
+    shape = "'messages'" if tag == "modern" else "legacy 'message'"
+
+    try:
+        # Field validators on Message/ChatRequestLegacy reject blank text, so this
+        # single pass covers every check in pydantic-core. A stray 'message' key
+        # next to 'messages' is ignored by ChatRequest.
+        parsed = _validate_payload(data)
+    except ValidationError as ve:
+        # Re-raise a friendlier error with compact details
+        raise ValueError(f"Invalid {shape} payload. Errors: {ve.errors()}") from ve
+
+    if isinstance(parsed, ChatRequestLegacy):
+        # Convert into modern ChatRequest with a single user message. parsed.message
+        # was already validated (same 1-5000 char constraint as Message.content),
+        # so construct without running the validators a second time.
+        return ChatRequest.model_construct(
+            messages=[Message.model_construct(role=RoleEnum.user, content=parsed.message)],
+            stream=False,
+            response_style=None,
+        )
+    return parsed
@@ -0,0 +1,49 @@
+"""
+Small in-process caches used to skip repeated upstream work.
+"""
+from collections import OrderedDict
+from time import monotonic
+from typing import Any, Hashable, Optional
+
+
+# PUBLIC_INTERFACE
+class TTLCache:
+    """Bounded LRU mapping whose entries expire ``ttl_s`` seconds after being set.
+
+    Not thread-safe; it is meant for state owned by the event loop. Expired
+    entries are dropped lazily when read, and the least recently used entry is
+    evicted once ``max_entries`` is exceeded.
+    """
+
+    __slots__ = ("_data", "_max_entries", "_ttl_s")
+
+    def __init__(self, max_entries: int, ttl_s: float) -> None:
+        self._data: "OrderedDict[Hashable, tuple[float, Any]]" = OrderedDict()
+        self._max_entries = max_entries
+        self._ttl_s = ttl_s
+
+    def get(self, key: Hashable) -> Optional[Any]:
+        """Return the cached value, or None when missing or expired."""
+        item = self._data.get(key)
+        if item is None:
+            return None
+        expires_at, value = item
+        if expires_at <= monotonic():
+            del self._data[key]
+            return None
+        self._data.move_to_end(key)
+        return value
+
+    def set(self, key: Hashable, value: Any) -> None:
+        """Store value under key, evicting the least recently used entry if full."""
+        self._data[key] = (monotonic() + self._ttl_s, value)
+        self._data.move_to_end(key)
+        if len(self._data) > self._max_entries:
+            self._data.popitem(last=False)
+
+    def clear(self) -> None:
+        """Drop every entry."""
+        self._data.clear()
+
+    def __len__(self) -> int:
+        return len(self._data)
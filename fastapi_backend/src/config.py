@@ -6,6 +6,8 @@ Supabase settings and optional OpenAI settings. Values are loaded from
 environment variables, with safe defaults where appropriate.
 
 Environment variables:
+- APP_ENV: Deployment environment name (default: development). "prod"/"production"
+  disables the interactive docs and the live OpenAPI schema.
 - FRONTEND_ORIGIN: Allowed CORS origin for the frontend (default: http://localhost:3000)
 
 - ENABLE_SUPABASE: Whether Supabase integration is enabled ("true"/"false", default: false)
@@ -20,6 +22,7 @@ Environment variables:
 from __future__ import annotations
 
 import os
+from dataclasses import dataclass, field
 from typing import Optional
 
 from dotenv import load_dotenv
@@ -29,6 +32,9 @@ from dotenv import load_dotenv
 load_dotenv()
 
 
+_TRUE_VALUES = frozenset({"1", "true", "yes", "y", "on"})
+
+
 def _get_bool_env(name: str, default: bool = False) -> bool:
     """
     Parse a boolean-like environment variable safely.
@@ -38,12 +44,21 @@ def _get_bool_env(name: str, default: bool = False) -> bool:
     val = os.getenv(name)
     if val is None:
         return default
-    return val.strip().lower() in ("1", "true", "yes", "y", "on")
+    return val.strip().lower() in _TRUE_VALUES
 
 
 # PUBLIC_INTERFACE
+@dataclass(frozen=True, slots=True)
 class Settings:
-    """Application settings loaded from environment variables."""
+    """Application settings loaded from environment variables.
+
+    Defaults are read from the environment when this module is imported. The
+    instance is immutable and slotted (no per-instance __dict__); keys and
+    secrets are left out of its repr.
+    """
+
+    # Deployment environment
+    APP_ENV: str = (os.getenv("APP_ENV") or "development").strip().lower()
 
     # CORS / Frontend origin
     FRONTEND_ORIGIN: str = os.getenv("FRONTEND_ORIGIN", "http://localhost:3000")
@@ -51,17 +66,21 @@ class Settings:
     # Optional Supabase configuration
     ENABLE_SUPABASE: bool = _get_bool_env("ENABLE_SUPABASE", default=False)
     SUPABASE_URL: Optional[str] = os.getenv("SUPABASE_URL") or None
-    SUPABASE_SERVICE_ROLE_KEY: Optional[str] = os.getenv("SUPABASE_SERVICE_ROLE_KEY") or None
-    SUPABASE_ANON_KEY: Optional[str] = os.getenv("SUPABASE_ANON_KEY") or None
-    SUPABASE_JWT_SECRET: Optional[str] = os.getenv("SUPABASE_JWT_SECRET") or None
+    SUPABASE_SERVICE_ROLE_KEY: Optional[str] = field(default=os.getenv("SUPABASE_SERVICE_ROLE_KEY") or None, repr=False)
+    SUPABASE_ANON_KEY: Optional[str] = field(default=os.getenv("SUPABASE_ANON_KEY") or None, repr=False)
+    SUPABASE_JWT_SECRET: Optional[str] = field(default=os.getenv("SUPABASE_JWT_SECRET") or None, repr=False)
 
     # Optional OpenAI configuration (server-only; never expose to frontend)
-    OPENAI_API_KEY: Optional[str] = os.getenv("OPENAI_API_KEY") or None
+    OPENAI_API_KEY: Optional[str] = field(default=os.getenv("OPENAI_API_KEY") or None, repr=False)
     OPENAI_MODEL: Optional[str] = os.getenv("OPENAI_MODEL") or None
 
     # PUBLIC_INTERFACE
-    @staticmethod
-    def supabase_is_configured() -> bool:
+    def is_production(self) -> bool:
+        """Return True when APP_ENV names a production deployment."""
+        return self.APP_ENV in ("prod", "production")
+
+    # PUBLIC_INTERFACE
+    def supabase_is_configured(self) -> bool:
         """
         Determine if Supabase can be considered configured for optional usage.
 
@@ -70,11 +89,11 @@ class Settings:
         - SUPABASE_URL is present
         - And at least one of SUPABASE_SERVICE_ROLE_KEY or SUPABASE_ANON_KEY is present
         """
-        if not Settings.ENABLE_SUPABASE:
+        if not self.ENABLE_SUPABASE:
             return False
-        if not Settings.SUPABASE_URL:
+        if not self.SUPABASE_URL:
             return False
-        if not (Settings.SUPABASE_SERVICE_ROLE_KEY or Settings.SUPABASE_ANON_KEY):
+        if not (self.SUPABASE_SERVICE_ROLE_KEY or self.SUPABASE_ANON_KEY):
             return False
         return True
 
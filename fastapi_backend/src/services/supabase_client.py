@@ -18,12 +18,14 @@ Usage:
 """
 from __future__ import annotations
 
+from functools import lru_cache
 from typing import Any, Optional
 
 from src.config import settings
 
 
 # PUBLIC_INTERFACE
+@lru_cache(maxsize=1)
 def get_supabase() -> Optional[Any]:
     """
     Returns a Supabase client placeholder if enabled and configured; otherwise None.
@@ -36,6 +38,8 @@ def get_supabase() -> Optional[Any]:
     Implementation notes:
     - This is a stub; it does not create a real client or perform network calls.
     - Future integration can import an actual SDK and initialize it here.
+    - Settings are fixed at startup, so the result is built once and memoized;
+      call reset_supabase_cache() after swapping settings (e.g. in tests).
     """
     if not settings.supabase_is_configured():
         return None
@@ -51,3 +55,9 @@ def get_supabase() -> Optional[Any]:
         # Do not include secrets in logs or public returns.
     }
     return client_stub
+
+
+# PUBLIC_INTERFACE
+def reset_supabase_cache() -> None:
+    """Forget the memoized get_supabase() result so the next call rebuilds it."""
+    get_supabase.cache_clear()
@@ -0,0 +1,23 @@
+"""
+Lightweight wall-clock timing helper used for duration logs and error metadata.
+"""
+from time import perf_counter
+
+
+# PUBLIC_INTERFACE
+class Timer:
+    """Measure elapsed time since construction.
+
+    ``ms`` is computed on access, so one timer can be read at every exit point
+    of a handler without repeating the perf_counter arithmetic.
+    """
+
+    __slots__ = ("start",)
+
+    def __init__(self) -> None:
+        self.start = perf_counter()
+
+    @property
+    def ms(self) -> int:
+        """Elapsed milliseconds, truncated to an int."""
+        return int((perf_counter() - self.start) * 1000)
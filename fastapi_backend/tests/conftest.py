@@ -0,0 +1,13 @@
+import pytest
+
+
+@pytest.fixture
+def no_openai(monkeypatch):
+    """Force the deterministic fallback so tests never reach api.openai.com.
+
+    Clearing the prebuilt headers marks OpenAI as unconfigured for both the
+    buffered and streaming paths, even when OPENAI_API_KEY is set in the
+    environment. Not autouse: patching imports the chat service, which the app
+    otherwise loads lazily, so only modules that post to /api/chat opt in.
+    """
+    monkeypatch.setattr("src.services.chat._OPENAI_HEADERS", None)
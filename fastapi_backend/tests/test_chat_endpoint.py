@@ -1,25 +1,36 @@
+import asyncio
+import json
+
+import pytest
 from fastapi.testclient import TestClient
 
 # Ensure import path for app
 from src.api.main import app
+from src.config import settings
 
 client = TestClient(app)
 
+# Every /api/chat call here must take the deterministic fallback
+pytestmark = pytest.mark.usefixtures("no_openai")
+
+# Shared request bodies; TestClient only serializes them, so reuse is safe.
+WATER_MESSAGES_PAYLOAD = {
+    "messages": [{"role": "user", "content": "What is water?"}],
+    "response_style": "plain",
+}
+LEGACY_PAYLOAD = {"message": "Give me examples of vegetables"}
+HI_PAYLOAD = {"message": "hi"}
+
 
 def test_chat_with_messages_shape_returns_200():
-    payload = {
-        "messages": [{"role": "user", "content": "What is water?"}],
-        "response_style": "plain",
-    }
-    resp = client.post("/api/chat", json=payload)
+    resp = client.post("/api/chat", json=WATER_MESSAGES_PAYLOAD)
     assert resp.status_code == 200, resp.text
     data = resp.json()
     assert "reply" in data and isinstance(data["reply"], str)
 
 
 def test_chat_with_legacy_message_shape_returns_200():
-    payload = {"message": "Give me examples of vegetables"}
-    resp = client.post("/api/chat", json=payload)
+    resp = client.post("/api/chat", json=LEGACY_PAYLOAD)
     assert resp.status_code == 200, resp.text
     data = resp.json()
     assert "reply" in data and isinstance(data["reply"], str)
@@ -35,3 +46,113 @@ def test_chat_invalid_payload_returns_400_with_clear_message():
     assert detail.get("code") == "invalid_payload"
     assert "accepted_shapes" in detail
     assert "validation" in detail
+
+
+def test_chat_malformed_json_returns_400_invalid_payload():
+    resp = client.post(
+        "/api/chat",
+        content=b'{"message": ',
+        headers={"Content-Type": "application/json"},
+    )
+    assert resp.status_code == 400
+    detail = resp.json().get("detail")
+    assert isinstance(detail, dict)
+    assert detail.get("code") == "invalid_payload"
+
+
+def test_chat_options_returns_empty_json():
+    resp = client.options("/api/chat")
+    assert resp.status_code == 200
+    assert resp.json() == {}
+
+
+def test_health_check_returns_healthy():
+    resp = client.get("/")
+    assert resp.status_code == 200
+    assert resp.json() == {"message": "Healthy"}
+
+
+def test_chat_upstream_error_returns_502_envelope(monkeypatch):
+    async def boom(*args, **kwargs):
+        raise RuntimeError("upstream exploded")
+
+    monkeypatch.setattr("src.services.chat.generate_reply", boom)
+    resp = client.post("/api/chat", json=HI_PAYLOAD)
+    assert resp.status_code == 502
+    error = resp.json()["error"]
+    assert error["code"] == "bad_gateway"
+    assert error["route"] == "/api/chat"
+    assert isinstance(error["duration_ms"], int)
+    assert "x-duration-ms" in resp.headers
+
+
+def test_chat_timeout_returns_504_envelope(monkeypatch):
+    async def too_slow(*args, **kwargs):
+        raise asyncio.TimeoutError()
+
+    monkeypatch.setattr("src.services.chat.generate_reply", too_slow)
+    resp = client.post("/api/chat", json=HI_PAYLOAD)
+    assert resp.status_code == 504
+    error = resp.json()["error"]
+    assert error["code"] == "gateway_timeout"
+    assert error["route"] == "/api/chat"
+    assert error["diagnostic"] == "route.await.generate_reply.timeout"
+
+
+def test_chat_unexpected_error_returns_500_envelope_with_cors(monkeypatch):
+    # generate_reply failures are 502s; anything else in the route is a 500
+    def broken(*args, **kwargs):
+        raise RuntimeError("normalizer exploded")
+
+    monkeypatch.setattr("src.api.main.normalize_to_chat_request", broken)
+    resp = client.post("/api/chat", json=HI_PAYLOAD, headers={"Origin": settings.FRONTEND_ORIGIN})
+    assert resp.status_code == 500
+    error = resp.json()["error"]
+    assert error["code"] == "internal_error"
+    assert error["route"] == "/api/chat"
+    assert isinstance(error["duration_ms"], int)
+    # Rendered inside the middleware stack, so the browser can read it
+    assert resp.headers["access-control-allow-origin"] == settings.FRONTEND_ORIGIN
+    assert "x-duration-ms" in resp.headers
+
+
+def test_chat_stream_returns_ndjson_deltas():
+    payload = {"messages": [{"role": "user", "content": "What is water?"}], "stream": True}
+    resp = client.post("/api/chat", json=payload)
+    assert resp.status_code == 200, resp.text
+    assert resp.headers["content-type"].startswith("application/x-ndjson")
+    lines = [json.loads(line) for line in resp.text.splitlines() if line]
+    assert lines and all(isinstance(line["delta"], str) for line in lines)
+    assert "".join(line["delta"] for line in lines).startswith("Water is")
+
+
+@pytest.mark.parametrize(
+    ("message", "reply_prefix"),
+    [("?", "Here's a concise answer"), ("What is water?", "Water is H₂O")],
+    ids=["trivial", "canned"],
+)
+def test_chat_answers_without_openai(monkeypatch, message, reply_prefix):
+    async def must_not_call(*args, **kwargs):
+        raise AssertionError(f"OpenAI should not be called for {message!r}")
+
+    monkeypatch.setattr("src.services.chat._OPENAI_HEADERS", {"Authorization": "Bearer test"})
+    monkeypatch.setattr("src.services.chat._call_openai_async", must_not_call)
+    resp = client.post("/api/chat", json={"message": message})
+    assert resp.status_code == 200, resp.text
+    assert resp.json()["reply"].startswith(reply_prefix)
+
+
+def test_chat_near_miss_of_canned_prompt_reaches_openai(monkeypatch):
+    # Canned prompts must match the whole message, so this still goes to the model
+    calls = []
+
+    async def fake_openai(messages, response_style):
+        calls.append(messages[-1].content)
+        return "Model reply."
+
+    monkeypatch.setattr("src.services.chat._OPENAI_HEADERS", {"Authorization": "Bearer test"})
+    monkeypatch.setattr("src.services.chat._call_openai_async", fake_openai)
+    resp = client.post("/api/chat", json={"message": "what is water pollution?"})
+    assert resp.status_code == 200, resp.text
+    assert resp.json()["reply"] == "Model reply."
+    assert calls == ["what is water pollution?"]
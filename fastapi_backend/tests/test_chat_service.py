@@ -0,0 +1,219 @@
+import asyncio
+
+import httpx
+import orjson
+import pytest
+
+from src.api.schemas import Message
+from src.services import chat
+
+# Not trivial and not a canned prompt, so generate_reply goes to OpenAI
+PROMPT = [Message(role="user", content="Tell me about rivers")]
+FRIENDLY_FALLBACK = "AI took too long to respond. Please try again."
+
+
+@pytest.fixture
+def openai_transport(monkeypatch):
+    """Route the chat service's OpenAI calls through an httpx.MockTransport.
+
+    Returns install(handler), which seats a pooled client backed by handler and
+    returns the list of requests it receives. Cooldown state and the reply
+    cache are reset around each test so nothing leaks into later ones.
+    """
+    monkeypatch.setattr(chat, "_OPENAI_HEADERS", {"Authorization": "Bearer test"})
+    monkeypatch.setattr(chat, "RETRY_BACKOFF_BASE_S", 0.0)
+    chat.reset_openai_cooldown()
+    chat._reply_cache.clear()
+
+    def install(handler):
+        calls = []
+
+        def record(request):
+            calls.append(request)
+            return handler(request)
+
+        monkeypatch.setattr(chat, "_http_client", httpx.AsyncClient(transport=httpx.MockTransport(record)))
+        return calls
+
+    yield install
+    chat.reset_openai_cooldown()
+    chat._reply_cache.clear()
+
+
+def _reply(messages=PROMPT, response_style=None):
+    return asyncio.run(chat.generate_reply(messages, response_style=response_style))
+
+
+def _status(code):
+    return lambda request: httpx.Response(code, json={"error": {"message": "nope"}})
+
+
+def _timeout(request):
+    raise httpx.ReadTimeout("stalled", request=request)
+
+
+@pytest.mark.parametrize("handler", [_status(401), _status(429), _timeout], ids=["401", "429", "timeout"])
+def test_failure_arms_cooldown_and_skips_transport(openai_transport, handler):
+    calls = openai_transport(handler)
+    assert _reply() == FRIENDLY_FALLBACK
+    assert chat._openai_cooling_down()
+
+    seen = len(calls)
+    assert _reply() == FRIENDLY_FALLBACK
+    assert len(calls) == seen  # answered inside the window without a request
+
+
+def test_cooldown_expires(openai_transport, monkeypatch):
+    now = [1000.0]
+    monkeypatch.setattr(chat, "perf_counter", lambda: now[0])
+    calls = openai_transport(_status(429))
+    _reply()
+    seen = len(calls)
+
+    now[0] += chat.OPENAI_FAILURE_COOLDOWN_S - 0.1
+    _reply()
+    assert len(calls) == seen
+
+    now[0] += 0.2
+    assert not chat._openai_cooling_down()
+    _reply()
+    assert len(calls) > seen
+
+
+def test_timeout_then_success_does_not_arm_cooldown(openai_transport):
+    calls = openai_transport(_sequence(
+        _timeout, _sse_response(_delta("ok"), "data: [DONE]"), _sse_response(_delta("Lakes."), "data: [DONE]")
+    ))
+    assert _reply() == "ok"
+    assert not chat._openai_cooling_down()
+
+    # A different prompt still reaches OpenAI
+    assert _reply([Message(role="user", content="Tell me about lakes")]) == "Lakes."
+    assert len(calls) == 3
+
+
+def test_success_clears_cooldown_started_meanwhile(openai_transport):
+    def healthy_after_concurrent_failure(request):
+        chat._start_openai_cooldown()  # another request failed while this one was in flight
+        return _sse_response(_delta("ok"), "data: [DONE]")
+
+    openai_transport(healthy_after_concurrent_failure)
+    assert _reply() == "ok"
+    assert not chat._openai_cooling_down()
+
+
+def test_server_error_does_not_arm_cooldown(openai_transport):
+    calls = openai_transport(_status(503))
+    assert _reply() == FRIENDLY_FALLBACK
+    assert not chat._openai_cooling_down()
+
+    seen = len(calls)
+    _reply()
+    assert len(calls) > seen
+
+
+def _sse_response(*frames):
+    """A 200 text/event-stream response whose body is the given SSE lines."""
+    body = "".join(f"{frame}\n\n" for frame in frames).encode()
+    return httpx.Response(200, content=body, headers={"content-type": "text/event-stream"})
+
+
+def _delta(content):
+    return "data: " + orjson.dumps({"choices": [{"delta": {"content": content}}]}).decode()
+
+
+def _sequence(*responses):
+    """Handler returning the given responses (or handlers) in order, one per request."""
+    pending = list(responses)
+
+    def handler(request):
+        item = pending.pop(0)
+        return item(request) if callable(item) else item
+
+    return handler
+
+
+def test_sse_deltas_are_joined_until_done(openai_transport):
+    calls = openai_transport(lambda request: _sse_response(
+        _delta("Rivers "), _delta("flow "), _delta("downhill."), "data: [DONE]", _delta(" ignored")
+    ))
+    assert _reply() == "Rivers flow downhill."
+    assert len(calls) == 1
+    sent = orjson.loads(calls[0].content)
+    assert sent["stream"] is True and sent["messages"][-1] == {"role": "user", "content": "Tell me about rivers"}
+
+
+def test_sse_skips_frames_without_content(openai_transport):
+    openai_transport(lambda request: _sse_response(
+        'data: {"choices":[{"delta":{"role":"assistant"}}]}',
+        'data: {"choices":[]}',
+        ": keep-alive comment",
+        "event: ping",
+        "data: {not json",
+        _delta("Still "),
+        'data: {"choices":[{"delta":{},"finish_reason":"stop"}]}',
+        _delta("here."),
+        "data: [DONE]",
+    ))
+    assert _reply() == "Still here."
+    # A garbled frame is skipped, not treated as a transport failure
+    assert not chat._openai_cooling_down()
+
+
+def test_server_error_is_retried_once(openai_transport):
+    calls = openai_transport(_sequence(_status(502), _sse_response(_delta("Recovered."), "data: [DONE]")))
+    assert _reply() == "Recovered."
+    assert len(calls) == 2
+
+
+def test_client_error_is_not_retried(openai_transport):
+    calls = openai_transport(_status(400))
+    assert _reply() == FRIENDLY_FALLBACK
+    assert len(calls) == 1
+
+
+def test_reply_cache_skips_upstream_for_identical_requests(openai_transport, monkeypatch):
+    calls = openai_transport(lambda request: _sse_response(_delta("Cached answer."), "data: [DONE]"))
+    assert _reply() == "Cached answer."
+    assert _reply() == "Cached answer."
+    assert len(calls) == 1
+
+    # response_style and model are part of the key
+    _reply(response_style="list")
+    assert len(calls) == 2
+    monkeypatch.setattr(chat, "_OPENAI_MODEL", "another-model")
+    _reply()
+    assert len(calls) == 3
+
+
+def test_reply_cache_does_not_store_fallbacks(openai_transport):
+    calls = openai_transport(_sequence(
+        _status(503), _status(503), _sse_response(_delta("Real answer."), "data: [DONE]")
+    ))
+    assert _reply() == FRIENDLY_FALLBACK
+    assert _reply() == "Real answer."
+    assert len(calls) == 3
+
+
+def _stream(messages=PROMPT):
+    async def collect():
+        return [chunk async for chunk in chat.stream_reply(messages)]
+
+    return asyncio.run(collect())
+
+
+def test_stream_forwards_deltas(openai_transport):
+    openai_transport(lambda request: _sse_response(_delta("Rivers "), _delta("flow."), "data: [DONE]"))
+    assert _stream() == ["Rivers ", "flow."]
+
+
+def test_stream_budget_covers_wait_for_first_delta(openai_transport, monkeypatch):
+    async def stalled(request):
+        await asyncio.sleep(5)
+        return _sse_response(_delta("Too late."), "data: [DONE]")
+
+    monkeypatch.setattr(chat, "OPENAI_CALL_TIMEOUT_S", 0.05)
+    openai_transport(stalled)
+    assert _stream() == [FRIENDLY_FALLBACK]
+    # The budget is per request; it says nothing about OpenAI's health
+    assert not chat._openai_cooling_down()
@@ -0,0 +1,46 @@
+import pytest
+from fastapi.testclient import TestClient
+
+from src.api.main import app
+from src.config import settings
+
+client = TestClient(app)
+ORIGIN = settings.FRONTEND_ORIGIN
+
+# Every /api/chat call here must take the deterministic fallback
+pytestmark = pytest.mark.usefixtures("no_openai")
+
+
+def test_preflight_from_frontend_origin_is_allowed():
+    resp = client.options(
+        "/api/chat",
+        headers={
+            "Origin": ORIGIN,
+            "Access-Control-Request-Method": "POST",
+            "Access-Control-Request-Headers": "content-type",
+        },
+    )
+    assert resp.status_code == 200
+    assert resp.headers["access-control-allow-origin"] == ORIGIN
+    assert resp.headers["access-control-allow-credentials"] == "true"
+    assert resp.headers["access-control-allow-headers"] == "content-type"
+    assert "POST" in resp.headers["access-control-allow-methods"]
+
+
+def test_preflight_from_other_origin_is_rejected():
+    resp = client.options(
+        "/api/chat",
+        headers={"Origin": "https://evil.example", "Access-Control-Request-Method": "POST"},
+    )
+    assert resp.status_code == 400
+    assert "access-control-allow-origin" not in resp.headers
+
+
+def test_simple_request_gets_cors_headers_only_for_frontend_origin():
+    allowed = client.post("/api/chat", json={"message": "hi"}, headers={"Origin": ORIGIN})
+    assert allowed.headers["access-control-allow-origin"] == ORIGIN
+    assert allowed.headers["access-control-allow-credentials"] == "true"
+
+    other = client.post("/api/chat", json={"message": "hi"}, headers={"Origin": "https://evil.example"})
+    assert other.status_code == 200
+    assert "access-control-allow-origin" not in other.headers
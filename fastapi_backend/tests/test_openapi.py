@@ -0,0 +1,10 @@
+from src.api.main import app
+
+
+def test_openapi_schema_is_built_once_per_process():
+    first = app.openapi()
+    second = app.openapi()
+    # FastAPI memoizes the schema on app.openapi_schema; repeated calls from
+    # tooling (scripts/generate_openapi.py, tests) must not rebuild it.
+    assert first is second
+    assert app.openapi_schema is first
@@ -0,0 +1,48 @@
+import os
+import shutil
+import subprocess
+import sys
+from pathlib import Path
+
+import orjson
+
+BACKEND_ROOT = Path(__file__).resolve().parents[1]
+
+# Runs in a fresh interpreter: main.py reads APP_ENV and looks for the schema file
+# at import time, so the production app cannot be built inside this process.
+_PROBE = """
+import orjson
+from fastapi.testclient import TestClient
+from src.api.main import app
+
+client = TestClient(app)
+docs = client.get("/docs")
+schema = client.get("/openapi.json")
+print(orjson.dumps({
+    "docs_status": docs.status_code,
+    "schema_status": schema.status_code,
+    "schema_type": schema.headers.get("content-type"),
+    "schema_body": schema.text,
+}).decode())
+"""
+
+
+def test_production_disables_docs_and_serves_pregenerated_schema(tmp_path):
+    # A copy of src/ next to its own interfaces/openapi.json, as written at deploy
+    # time by scripts/generate_openapi.py, keeps the real tree untouched.
+    shutil.copytree(BACKEND_ROOT / "src", tmp_path / "src", ignore=shutil.ignore_patterns("__pycache__"))
+    schema_path = tmp_path / "interfaces" / "openapi.json"
+    schema_path.parent.mkdir()
+    schema_path.write_bytes(b'{"openapi": "3.1.0", "info": {"title": "pre-generated", "version": "0"}}')
+
+    env = {**os.environ, "APP_ENV": "production", "PYTHONPATH": str(tmp_path)}
+    result = subprocess.run(
+        [sys.executable, "-c", _PROBE], cwd=tmp_path, env=env, capture_output=True, text=True, timeout=60
+    )
+    assert result.returncode == 0, result.stderr
+    probe = orjson.loads(result.stdout.strip().splitlines()[-1])
+
+    assert probe["docs_status"] == 404
+    assert probe["schema_status"] == 200
+    assert probe["schema_type"].startswith("application/json")
+    assert probe["schema_body"] == schema_path.read_text()
@@ -0,0 +1,7 @@
+from src.api.schemas import Message
+
+
+def test_message_normalized_follows_content_updates():
+    message = Message(role="user", content="  hi  ")
+    assert message.normalized == "hi"
+    assert message.model_copy(update={"content": " new "}).normalized == "new"
@@ -0,0 +1,21 @@
+from dataclasses import replace
+
+from src.config import settings
+from src.services import supabase_client
+
+
+def test_get_supabase_is_memoized_until_reset(monkeypatch):
+    configured = replace(settings, ENABLE_SUPABASE=True, SUPABASE_URL="https://example.supabase.co", SUPABASE_ANON_KEY="anon")
+    monkeypatch.setattr(supabase_client, "settings", configured)
+    supabase_client.reset_supabase_cache()
+    try:
+        client = supabase_client.get_supabase()
+        assert client["auth"] == "anon"
+        assert supabase_client.get_supabase() is client
+
+        monkeypatch.setattr(supabase_client, "settings", settings)
+        assert supabase_client.get_supabase() is client  # still cached
+        supabase_client.reset_supabase_cache()
+        assert supabase_client.get_supabase() is None
+    finally:
+        supabase_client.reset_supabase_cache()